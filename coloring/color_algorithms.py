@@ -1,78 +1,273 @@
+from dataclasses import dataclass
+from functools import lru_cache
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import Normalize
+import matplotlib
 from coloring import gradient
 from ui.zoom_function.debug_logger import DebugLogger
-from ui.zoom_function.enums import LogLevel
+
+_INV_TWO_PI = 1.0 / (2 * np.pi) # 角度 [-π, π] を [-0.5, 0.5] に縮める係数
+_BUFFERS = {} # 作業用バッファ：(型, 名前) ごとに保持し、再描画（ズーム・パン）のたびに使い回す
+
+def _pack_rgba(rgba):
+    """ uint8 の RGBA（最後の軸が4）を、1画素 = 1要素の uint32 配列として見る（4チャンネルをまとめて1回で読み書きできる） """
+    return np.ascontiguousarray(rgba, dtype=np.uint8).view(np.uint32).reshape(np.shape(rgba)[:-1])
+
+_BLACK = _pack_rgba(np.array([0, 0, 0, 255], dtype=np.uint8))[()] # 単色（黒）の画素値
+
+def _get_buf(size, dtype, name):
+    """ 長さ size の1次元作業用バッファを取得（確保済みの配列が足りる長さなら、その先頭部分を再利用） """
+    key = (np.dtype(dtype), name)
+    buf = _BUFFERS.get(key)
+    if buf is None or buf.size < size:
+        buf = np.empty(size, dtype)
+        _BUFFERS[key] = buf
+    return buf[:size]
+
+def _take_z(z_vals, idx):
+    """ 位置 idx の z を取り出し、complex64 の実部・虚部（float32 のビュー）として返す（色の区別には単精度で十分で、読み込む量が半分になる） """
+    z = z_vals.ravel()[idx].astype(np.complex64, copy=False)
+    return z.real, z.imag
+
+def _abs_squared(z_real, z_imag):
+    """ |z|² = 実部² + 虚部² を作業用バッファ上で計算（np.abs のような hypot・平方根の計算をしない） """
+    abs2 = np.square(z_real, out=_get_buf(z_real.size, z_real.dtype, "work"))
+    abs2 += np.square(z_imag, out=_get_buf(z_imag.size, z_imag.dtype, "work2"))
+    return abs2
+
+def _angle_index(z_real, z_imag, n):
+    """ 偏角を、要素数 n の色表の番号に直接変換（arctan2 を一度だけ計算し、縮尺と平行移動はその場で行う） """
+    angle = np.arctan2(z_imag, z_real, out=_get_buf(z_real.size, z_real.dtype, "angle").reshape(z_real.shape))
+    angle *= n * _INV_TWO_PI # [-π, π] → [-n/2, n/2]
+    angle += n * 0.5 # → [0, n]
+    idx = _get_buf(angle.size, np.intp, "index").reshape(angle.shape)
+    np.copyto(idx, angle, casting="unsafe") # 小数部の切り捨て
+    np.minimum(idx, n - 1, out=idx) # 偏角がちょうど π のときだけ n になるので、最後の色にまとめる
+    return idx
+
+@lru_cache(maxsize=32)
+def _get_cmap(cmap_name):
+    """ カラーマップを取得（レジストリは取得のたびにコピーを返すため、名前ごとにキャッシュする） """
+    return matplotlib.colormaps[cmap_name]
+
+@lru_cache(maxsize=32)
+def _get_lut(cmap_name):
+    """ カラーマップの色表（N 要素、RGBA を uint32 に詰めたもの）を取得（カラーマップ内部の色表をそのまま取り出したもの） """
+    cmap = _get_cmap(cmap_name)
+    lut = _pack_rgba(cmap(np.arange(cmap.N), bytes=True)) # 整数を渡すと補間せず色表の値をそのまま返す
+    lut.setflags(write=False) # キャッシュ共有のため読み取り専用
+    return lut
+
+def _normalize(values, vmin, vmax):
+    """ [vmin, vmax] → [0, 1] の線形変換をその場で行う（Normalize のようなマスク付き配列は作らない。範囲外の切り詰めは _lookup が行う） """
+    values -= vmin
+    values *= 1.0 / (vmax - vmin) if vmax > vmin else 0.0 # vmin == vmax のときは Normalize と同じく全て 0
+    return values
+
+def _gather(lut, idx):
+    """ 色表から番号 idx の画素値を取り出す（結果は作業用バッファに書き込み、毎回新しい配列を確保しない） """
+    return np.take(lut, idx, out=_get_buf(idx.size, lut.dtype, "pixels").reshape(idx.shape))
+
+def _lookup(lut, values):
+    """ [0, 1] の値を色表で画素値に変換（matplotlib の Colormap と同じ区切り方） """
+    n = lut.shape[0]
+    values = np.asarray(values)
+    # 途中の配列は作業用バッファを使う（スカラー（0次元）でも配列として扱う）
+    # float32 の値は float32 のまま番号に変換する（float64 への変換で読み書きする量を倍にしない。matplotlib も入力の型のまま計算する）
+    dtype = np.result_type(values.dtype, np.float32)
+    scaled = np.multiply(values, n, out=_get_buf(values.size, dtype, "lookup").reshape(values.shape))
+    np.clip(scaled, 0, n - 1, out=scaled) # 範囲外は端の色（matplotlib の under/over の既定値と同じ）
+    idx = _get_buf(scaled.size, np.intp, "index").reshape(scaled.shape)
+    np.copyto(idx, scaled, casting="unsafe") # 小数部の切り捨て
+    return _gather(lut, idx)
+
+@lru_cache(maxsize=16)
+def _linear_lut(cmap_name, max_iterations):
+    """ 反復回数 0..max_iterations → 画素値の対応表（反復回数は整数なので、色は事前に一度だけ計算しておく） """
+    values = _normalize(np.arange(max_iterations + 1, dtype=np.float64), 1, max_iterations)
+    lut = _pack_rgba(_get_cmap(cmap_name)(values, bytes=True))
+    lut.setflags(write=False) # キャッシュ共有のため読み取り専用
+    return lut
+
+@lru_cache(maxsize=16)
+def _log_lut(cmap_name, max_iterations):
+    """ 反復回数 0..max_iterations → 画素値の対応表（log(反復回数) / log(最大反復回数) を事前に一度だけ計算しておく） """
+    values = np.zeros(max_iterations + 1) # 反復回数 0 は発散部に現れないので 0 のまま
+    np.log(np.arange(1, max_iterations + 1), out=values[1:])
+    values *= 1.0 / np.log(max_iterations) if max_iterations > 1 else 0.0 # 除算は定数の逆数を掛ける形にまとめる
+    lut = _pack_rgba(_get_cmap(cmap_name)(values, bytes=True))
+    lut.setflags(write=False) # キャッシュ共有のため読み取り専用
+    return lut
+
+@dataclass(frozen=True)
+class ColoringRequest:
+    """着色に使うパラメータをまとめたデータクラス（params の辞書を一度だけ読み、各着色関数にはこれを渡す）"""
+    diverge_algorithm: str
+    non_diverge_algorithm: str
+    diverge_colormap: str
+    non_diverge_colormap: str
+    max_iterations: int
+    fractal_type: str
+    c: complex # ジュリア集合の定数 C（非発散部のパラメータ(C)で使用）
+
+    @classmethod
+    def from_params(cls, params: dict) -> "ColoringRequest":
+        """ パラメータの辞書から作成 """
+        return cls(
+            diverge_algorithm=params["diverge_algorithm"],
+            non_diverge_algorithm=params["non_diverge_algorithm"],
+            diverge_colormap=params["diverge_colormap"],
+            non_diverge_colormap=params["non_diverge_colormap"],
+            max_iterations=params["max_iterations"],
+            fractal_type=params["fractal_type"],
+            c=complex(params.get("c_real", 0.0), params.get("c_imag", 0.0)))
+
+# 発散部の着色：各関数は (発散部の位置, 発散部の反復回数, z_vals, req) を受け取り、発散部の画素値（uint32）を返す
+# z が必要なアルゴリズムだけが _take_z で取り出す（反復回数だけで決まるものは z を読まない）
+
+def _diverge_linear(div_idx, div_iter, z_vals, req):
+    """ 反復回数線形マッピング """
+    return _gather(_linear_lut(req.diverge_colormap, req.max_iterations), div_iter)
+
+def _diverge_smoothing(div_idx, div_iter, z_vals, req):
+    """ スムージングカラーリング """
+    div_re, div_im = _take_z(z_vals, div_idx)
+    # nu = log(log|z| / log2) / log2 = log2(log2|z|) なので、除算なしで log2 を2回かけるだけで済む
+    # さらに log2|z| = 0.5 * log2(re² + im²) とすれば、|z| の平方根も不要
+    # |z|² → nu → 反復回数 - nu を同じバッファ上で順に計算（途中配列を確保しない）
+    smooth_iter = _abs_squared(div_re, div_im)
+    np.log2(smooth_iter, out=smooth_iter)
+    smooth_iter *= 0.5
+    np.log2(smooth_iter, out=smooth_iter)
+    np.subtract(div_iter, smooth_iter, out=smooth_iter)
+    _normalize(smooth_iter, 0, req.max_iterations) # [0, max_iterations] → [0, 1] も同じバッファ上で行う
+    return _lookup(_get_lut(req.diverge_colormap), smooth_iter)
+
+def _diverge_histogram(div_idx, div_iter, z_vals, req):
+    """ ヒストグラム平坦化法 """
+    # 区切り（最小〜最大を max_iterations 等分）と正規化は np.histogram + np.interp の従来どおり
+    # ただし反復回数は整数なので、画素ごとではなく「反復回数ごとの個数」で数え、補間も反復回数ごとに一度だけ行う
+    counts = np.bincount(div_iter)
+    present = np.flatnonzero(counts)
+    lo, hi = int(present[0]), int(present[-1]) # 発散部の反復回数の最小・最大（np.histogram の範囲と同じ）
+    values = np.arange(lo, hi + 1)
+    hist, bins = np.histogram(values, bins=req.max_iterations, range=(lo, hi), weights=counts[lo:], density=True)
+    cdf = hist.cumsum()
+    cdf = cdf / cdf[-1]
+    table = np.interp(values, bins[:-1], cdf) # 反復回数 lo..hi → 平坦化後の値
+    remapped = table[div_iter - lo]
+    return _lookup(_get_lut(req.diverge_colormap), remapped)
+
+def _diverge_log(div_idx, div_iter, z_vals, req):
+    """ 反復回数対数マッピング """
+    return _gather(_log_lut(req.diverge_colormap, req.max_iterations), div_iter)
+
+def _diverge_distance(div_idx, div_iter, z_vals, req):
+    """ 距離カラーリング """
+    div_re, div_im = _take_z(z_vals, div_idx)
+    dist = np.sqrt(_abs_squared(div_re, div_im), out=_get_buf(div_re.size, div_re.dtype, "work"))
+    return _lookup(_get_lut(req.diverge_colormap), _normalize(dist, 0, 10))
+
+def _diverge_angle(div_idx, div_iter, z_vals, req):
+    """ 角度カラーリング """
+    div_re, div_im = _take_z(z_vals, div_idx)
+    lut = _get_lut(req.diverge_colormap)
+    return _gather(lut, _angle_index(div_re, div_im, lut.shape[0]))
+
+def _diverge_potential(div_idx, div_iter, z_vals, req):
+    """ ポテンシャル関数法 """
+    div_re, div_im = _take_z(z_vals, div_idx)
+    potential = np.sqrt(_abs_squared(div_re, div_im), out=_get_buf(div_re.size, div_re.dtype, "work"))
+    # 1 - 1 / log(|z| + 1)：発散部だけを扱っているので |z| > 2 であり、マスクも 0 除算の分岐も要らない
+    np.log1p(potential, out=potential)
+    np.reciprocal(potential, out=potential)
+    np.subtract(1, potential, out=potential)
+    return _lookup(_get_lut(req.diverge_colormap), potential)
+
+def _diverge_orbit_trap(div_idx, div_iter, z_vals, req):
+    """ 軌道トラップ法 """
+    div_re, div_im = _take_z(z_vals, div_idx)
+    # トラップ点 (1, 0) までの距離：実部・虚部のビューに対する実数演算だけで求める（複素数の一時配列は作らない）
+    trap_dist = np.subtract(div_re, 1.0, out=_get_buf(div_re.size, div_re.dtype, "work"))
+    np.hypot(trap_dist, div_im, out=trap_dist)
+    return _lookup(_get_lut(req.diverge_colormap), _normalize(trap_dist, 0, 2))
+
+# 非発散部の着色：各関数は (非発散部の位置, 画像の形状, z_vals, req, logger) を受け取り、非発散部の画素値を返す
+
+def _non_diverge_solid(non_div_idx, shape, z_vals, req, logger):
+    """ 単色 """
+    return _BLACK
+
+def _non_diverge_gradient(non_div_idx, shape, z_vals, req, logger):
+    """ グラデーション """
+    # 画像全体ではなく、非発散部の位置だけでグラデーションを計算する
+    grad = gradient.compute_gradient(shape, logger, indices=non_div_idx)
+    return _lookup(_get_lut(req.non_diverge_colormap), grad)
+
+def _non_diverge_param_c(non_div_idx, shape, z_vals, req, logger):
+    """ パラメータ(C) """
+    non_lut = _get_lut(req.non_diverge_colormap)
+    if req.fractal_type == "Julia":
+        angle = np.angle(req.c) * _INV_TWO_PI + 0.5
+        return _lookup(non_lut, angle)
+    non_re, non_im = _take_z(z_vals, non_div_idx)
+    return _gather(non_lut, _angle_index(non_re, non_im, non_lut.shape[0]))
+
+def _non_diverge_param_z(non_div_idx, shape, z_vals, req, logger):
+    """ パラメータ(Z) """
+    non_lut = _get_lut(req.non_diverge_colormap)
+    # 画像全体ではなく、非発散部の z だけを取り出してから偏角を計算する
+    non_re, non_im = _take_z(z_vals, non_div_idx)
+    return _gather(non_lut, _angle_index(non_re, non_im, non_lut.shape[0]))
+
+# アルゴリズム名 → 着色関数の対応表（import 時に一度だけ作り、呼び出しごとの文字列比較の連鎖をなくす）
+_DIVERGE_ALGORITHMS = {
+    "反復回数線形マッピング": _diverge_linear,
+    "スムージングカラーリング": _diverge_smoothing,
+    "ヒストグラム平坦化法": _diverge_histogram,
+    "反復回数対数マッピング": _diverge_log,
+    "距離カラーリング": _diverge_distance,
+    "角度カラーリング": _diverge_angle,
+    "ポテンシャル関数法": _diverge_potential,
+    "軌道トラップ法": _diverge_orbit_trap,
+}
+_NON_DIVERGE_ALGORITHMS = {
+    "単色": _non_diverge_solid,
+    "グラデーション": _non_diverge_gradient,
+    "パラメータ(C)": _non_diverge_param_c,
+    "パラメータ(Z)": _non_diverge_param_z,
+}
 
 def apply_coloring_algorithm(results, params, logger: DebugLogger):
     """ 着色アルゴリズムを適用して結果を返す """
-    iterations = results['iterations']
-    mask = results['mask']
-    z_vals = results['z_vals']
-    # RGBA画像用の配列
-    colored = np.zeros((*iterations.shape, 4), dtype=np.float32)
-    divergent = iterations > 0
-    if np.any(divergent):
-        # 発散する場合の処理
-        algo = params["diverge_algorithm"]
-        if algo == "反復回数線形マッピング":
-            norm = Normalize(1, params["max_iterations"])
-            colored[divergent] = plt.cm.get_cmap(params["diverge_colormap"])(norm(iterations[divergent]))
-        elif algo == "スムージングカラーリング":
-            log_zn = np.log(np.abs(z_vals))
-            nu = np.log(log_zn/np.log(2)) / np.log(2)
-            smooth_iter = iterations - nu
-            smooth_iter[mask] = 0
-            norm = Normalize(0, params["max_iterations"])
-            colored[divergent] = plt.cm.get_cmap(params["diverge_colormap"])(norm(smooth_iter[divergent]))
-        elif algo == "ヒストグラム平坦化法":
-            hist, bins = np.histogram(iterations[divergent], bins=params["max_iterations"], density=True)
-            cdf = hist.cumsum()
-            cdf = cdf / cdf[-1]
-            remapped = np.interp(iterations[divergent], bins[:-1], cdf)
-            colored[divergent] = plt.cm.get_cmap(params["diverge_colormap"])(remapped)
-        elif algo == "反復回数対数マッピング":
-            iter_log = np.zeros_like(iterations, dtype=float)
-            iter_log[divergent] = np.log(iterations[divergent]) / np.log(params["max_iterations"])
-            colored[divergent] = plt.cm.get_cmap(params["diverge_colormap"])(iter_log[divergent])
-        elif algo == "距離カラーリング":
-            dist = np.abs(z_vals)
-            dist[mask] = 0
-            norm = Normalize(0, 10)
-            colored[divergent] = plt.cm.get_cmap(params["diverge_colormap"])(norm(dist[divergent]))
-        elif algo == "角度カラーリング":
-            angles = np.angle(z_vals) / (2 * np.pi) + 0.5
-            colored[divergent] = plt.cm.get_cmap(params["diverge_colormap"])(angles[divergent])
-        elif algo == "ポテンシャル関数法":
-            potential = 1 - 1 / np.log(np.abs(z_vals) + 1)
-            potential[mask] = 0
-            colored[divergent] = plt.cm.get_cmap(params["diverge_colormap"])(potential[divergent])
-        elif algo == "軌道トラップ法":
-            trap_dist = np.abs(z_vals - 1.0)
-            trap_dist[mask] = float('inf')
-            norm = Normalize(0, 2)
-            colored[divergent] = plt.cm.get_cmap(params["diverge_colormap"])(norm(trap_dist[divergent]))
-    non_divergent = ~divergent
-    if np.any(non_divergent):
+    req = ColoringRequest.from_params(params) # 着色に使うパラメータは、ここで一度だけ取り出す
+    # 以降は ravel() をビューとして使うため、C 連続な配列にそろえておく（既に連続ならコピーしない）
+    iterations = np.ascontiguousarray(results['iterations'])
+    z_vals = np.ascontiguousarray(results['z_vals'])
+    # RGBA画像用の配列（表示用なので 8bit で持つ：float32 の 1/4 のメモリ帯域で済む）
+    # 全画素を発散部・非発散部のどちらかの処理で必ず書き込むので、0 での初期化はしない
+    colored = np.empty((*iterations.shape, 4), dtype=np.uint8)
+    # 発散部のマスク（反復回数 > 0）は作業用バッファに書き込み、呼び出しのたびに画像サイズの配列を確保しない
+    divergent = np.greater(iterations, 0, out=_get_buf(iterations.size, np.bool_, "mask").reshape(iterations.shape))
+    # 発散部の位置を平坦化したインデックスとして一度だけ求め、取り出し・書き戻しの両方で使い回す
+    div_idx = np.flatnonzero(divergent)
+    # colored を 1画素 = 1要素（uint32）の1次元配列として見るビュー（コピーではない）：書き込みは全てこれを通す
+    flat_colored = colored.view(np.uint32).reshape(-1)
+    n_div = div_idx.size
+    if n_div > 0:
+        # 発散する場合の処理（発散部の値を一度だけ取り出し、以降の計算はその1次元配列上だけで行う）
+        # 着色の精度は 8bit 分あれば足りるので、z を使うアルゴリズムは発散部を complex64（実部・虚部とも float32）で計算する
+        color_func = _DIVERGE_ALGORITHMS.get(req.diverge_algorithm)
+        if color_func is None: # 未知のアルゴリズム名：透明のまま
+            flat_colored[div_idx] = 0
+        else:
+            flat_colored[div_idx] = color_func(div_idx, iterations.ravel()[div_idx], z_vals, req)
+    if n_div < divergent.size: # 全点が発散した場合は、非発散部のマスクも作らずに終わる
         # 発散しない場合の処理
-        non_algo = params["non_diverge_algorithm"]
-        if non_algo == "単色":
-            colored[non_divergent] = [0, 0, 0, 1]
-        elif non_algo == "グラデーション":
-            grad = gradient.compute_gradient(iterations.shape, logger)
-            colored[non_divergent] = plt.cm.get_cmap(params["non_diverge_colormap"])(grad[non_divergent])
-        elif non_algo == "パラメータ(C)":
-            if params["fractal_type"] == "Julia":
-                c_val = complex(params["c_real"], params["c_imag"])
-                angle = (np.angle(c_val) / (2 * np.pi)) + 0.5
-                colored[non_divergent] = plt.cm.get_cmap(params["non_diverge_colormap"])(angle)
-            else:
-                c_real, c_imag = np.real(z_vals), np.imag(z_vals)
-                angle = (np.arctan2(c_imag, c_real) / (2 * np.pi)) + 0.5
-                colored[non_divergent] = plt.cm.get_cmap(params["non_diverge_colormap"])(angle[non_divergent])
-        elif non_algo == "パラメータ(Z)":
-            z_real, z_imag = np.real(z_vals), np.imag(z_vals)
-            angle = (np.arctan2(z_imag, z_real) / (2 * np.pi)) + 0.5
-            colored[non_divergent] = plt.cm.get_cmap(params["non_diverge_colormap"])(angle[non_divergent])
+        # 発散部のマスクはもう使わないので、その場で反転して非発散部のマスクにする（新しい配列を確保しない）
+        non_div_idx = np.flatnonzero(np.logical_not(divergent, out=divergent))
+        color_func = _NON_DIVERGE_ALGORITHMS.get(req.non_diverge_algorithm)
+        if color_func is None: # 未知のアルゴリズム名：透明のまま
+            flat_colored[non_div_idx] = 0
+        else:
+            flat_colored[non_div_idx] = color_func(non_div_idx, iterations.shape, z_vals, req, logger)
     return colored
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+import numpy as np
+from ui.zoom_function.debug_logger import DebugLogger
+from ui.zoom_function.enums import LogLevel
+
+def _freeze(value):
+    """ パラメータの値をキーに使えるハッシュ可能な値に変換（配列・リストはタプルにする） """
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+class ColorCache:
+    """ 描画結果（着色済みの画像・フラクタルの計算結果）をパラメータごとに保持するクラス（最近使われていないものから破棄する） """
+    def __init__(self, logger: DebugLogger, max_size: int = 16):
+        self.logger = logger
+        self.logger.log(LogLevel.INIT, "ColorCache")
+        self.max_size = max_size
+        self.cache = OrderedDict() # 古い順に並ぶ：取得・登録のたびに末尾へ移動する
+
+    def create_cache_key(self, params: dict) -> tuple:
+        """ パラメータからキャッシュキーを作成（文字列化はせず、値のタプルをそのままキーにする。取得・登録の両方で使えるよう一度だけ作る） """
+        return tuple(sorted((k, _freeze(v)) for k, v in params.items()))
+
+    def get_cache(self, key: tuple):
+        """ キャッシュから描画結果を取得（無ければ None） """
+        data = self.cache.get(key)
+        if data is not None:
+            self.cache.move_to_end(key) # 最近使ったものとして末尾へ
+            self.logger.log(LogLevel.DEBUG, "キャッシュヒット")
+        return data
+
+    def put_cache(self, key: tuple, data) -> None:
+        """ 描画結果をキャッシュに登録（上限を超えたら最も長く使われていないものを破棄） """
+        self.cache[key] = data
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
@@ -1,10 +1,29 @@
+import math
+from functools import lru_cache
 import numpy as np
 from ui.zoom_function.debug_logger import DebugLogger
 from ui.zoom_function.enums import LogLevel
 
-def compute_gradient(shape, logger: DebugLogger):
-    """ グラデーションを計算 """
+def compute_gradient(shape, logger: DebugLogger, indices=None):
+    """ グラデーションを計算（indices を指定した場合は、平坦化したその位置の値だけを1次元配列で返す） """
     logger.log(LogLevel.DEBUG, "グラデーション計算開始")
-    x, y = np.indices(shape)
-    normalized_distance = np.sqrt((x - shape[0]/2)**2 + (y - shape[1]/2)**2) / np.sqrt((shape[0]/2)**2 + (shape[1]/2)**2)
+    # 全体の戻り値は形状ごとのキャッシュを共有しているため読み取り専用（書き換える場合は呼び出し側でコピーすること）
+    normalized_distance = _compute_gradient_cached(shape[0], shape[1])
+    if indices is not None:
+        return normalized_distance.ravel()[indices]
+    return normalized_distance
+
+@lru_cache(maxsize=8)
+def _compute_gradient_cached(height, width):
+    """ グラデーションの計算本体（形状だけで決まるので、同じ解像度での再描画では計算し直さない） """
+    center_x, center_y = height / 2, width / 2
+    inv_max_distance = 1.0 / math.hypot(center_x, center_y) # 除算は最後に逆数を掛ける形にする
+    # 距離² = 縦方向の距離² + 横方向の距離² と分けられるので、各軸の1次元配列だけ計算しておく
+    dist_x2 = np.square(np.arange(height, dtype=np.float32) - np.float32(center_x))
+    dist_y2 = np.square(np.arange(width, dtype=np.float32) - np.float32(center_y))
+    # 縦・横の1次元配列をブロードキャストで全体に広げる（np.indices のような全体サイズの配列は作らない）
+    normalized_distance = np.add(dist_x2[:, np.newaxis], dist_y2[np.newaxis, :])
+    np.sqrt(normalized_distance, out=normalized_distance) # hypot より平方根のほうが速い
+    normalized_distance *= np.float32(inv_max_distance)
+    normalized_distance.setflags(write=False) # キャッシュ共有のため読み取り専用
     return normalized_distance
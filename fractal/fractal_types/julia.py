@@ -1,23 +1,39 @@
 import numpy as np
 from ui.zoom_function.debug_logger import DebugLogger
-from ui.zoom_function.enums import LogLevel
 
 def compute_julia(Z, C, max_iter, logger: DebugLogger):
     """ ジュリア集合の計算 """
     shape = Z.shape
-    iterations = np.zeros(shape, dtype=int)
-    z = Z.copy()
-    # 初期マスク：絶対値2以下の点
-    mask = np.abs(z) <= 2.0
-    z_vals = np.zeros(shape, dtype=complex)
+    iterations = np.zeros(shape, dtype=np.int32) # 反復回数は最大でも数千なので int32 で足りる（着色時の読み込み量が半分になる）
+    z = Z.ravel().copy() # 平坦化した z：発散した点の値はここに書き戻す
+    flat_iterations = iterations.reshape(-1) # 平坦化したビュー（コピーではない）
+    # 初期マスク：絶対値2以下の点（以降は、まだ発散していない点の位置と z の値だけを詰めた配列で反復する）
+    active = np.flatnonzero(np.abs(z) <= 2.0)
+    z_active = z[active]
+    mask_idx = active
+    updated = False # z が一度でも更新されたか
     for i in range(max_iter):
-        mask = np.abs(z) <= 2.0
-        if not np.any(mask):
+        mask_idx = active # この反復の開始時点で発散していない点
+        if active.size == 0:
             break
-        z[mask] = z[mask]**2 + C
-        iterations[mask & (np.abs(z) > 2.0)] = i + 1
-        z_vals = z.copy()
-    iterations[mask] = 0
+        # 画像全体ではなく、まだ発散していない点だけを計算する（反復が進むほど配列が小さくなる）
+        np.square(z_active, out=z_active)
+        z_active += C
+        still = np.abs(z_active) <= 2.0
+        escaped = ~still
+        escaped_idx = active[escaped]
+        flat_iterations[escaped_idx] = i + 1
+        z[escaped_idx] = z_active[escaped] # 発散した点の z はこれ以上変わらないので、ここで書き戻す
+        active = active[still]
+        z_active = z_active[still]
+        updated = True
+    z[active] = z_active # 最後まで発散しなかった点の z を書き戻す
+    flat_iterations[mask_idx] = 0
+    mask = np.zeros(shape, dtype=bool)
+    mask.reshape(-1)[mask_idx] = True
+    # 着色に渡す最終的な z：反復のたびに複製せず、最後に一度だけ complex64（着色には単精度で十分）として取り出す
+    # 一度も更新されなかった場合は、従来どおり 0 とする
+    z_vals = z.reshape(shape).astype(np.complex64) if updated else np.zeros(shape, dtype=np.complex64)
     return {
         'iterations': iterations,
         'mask': mask,
@@ -1,11 +1,45 @@
 import numpy as np
 from coloring import color_algorithms
+from coloring.color_cache import ColorCache
 from fractal.fractal_types import julia, mandelbrot
 from ui.zoom_function.debug_logger import DebugLogger
 from ui.zoom_function.enums import LogLevel
 
+_COLOR_CACHE = None # 描画結果のキャッシュ：再描画のたびに作り直さず、モジュール全体で1つを使い続ける
+_RESULT_CACHE = None # フラクタルの計算結果のキャッシュ：着色の設定だけを変えたときに、計算をやり直さない
+# 着色だけに使うパラメータ：これらだけが変わった場合は、フラクタルの計算結果をそのまま使える
+_COLORING_PARAMS = ("diverge_algorithm", "non_diverge_algorithm", "diverge_colormap", "non_diverge_colormap")
+
 def render_fractal(params, logger: DebugLogger) -> np.ndarray:
     """ 設定されたパラメータでフラクタルを描画 """
+    global _COLOR_CACHE, _RESULT_CACHE
+    if _COLOR_CACHE is None:
+        _COLOR_CACHE = ColorCache(logger=logger, max_size=16)
+        _RESULT_CACHE = ColorCache(logger=logger, max_size=4)
+    # 同じパラメータで描画済みなら、フラクタルの計算も着色もせずにそのまま返す（ズームのキャンセル・パラメータの戻しなど）
+    cache_key = _COLOR_CACHE.create_cache_key(params) # 取得と登録で同じキーを使い回す
+    cached = _COLOR_CACHE.get_cache(cache_key)
+    if cached is not None:
+        return cached
+    # カラーマップ・着色アルゴリズムだけを切り替えた場合は、フラクタルの計算を省いて着色だけをやり直す
+    result_key = _RESULT_CACHE.create_cache_key(
+        {k: v for k, v in params.items() if k not in _COLORING_PARAMS})
+    results = _RESULT_CACHE.get_cache(result_key)
+    if results is None:
+        results = _compute_fractal(params, logger)
+        for values in results.values():
+            values.setflags(write=False) # 着色のたびに使い回すため、書き換えられないようにする
+        _RESULT_CACHE.put_cache(result_key, results)
+    # 着色アルゴリズムの適用
+    logger.log(LogLevel.DEBUG, "着色アルゴリズムの適用開始")
+    colored = color_algorithms.apply_coloring_algorithm(results, params, logger)
+    colored.setflags(write=False) # キャッシュと呼び出し側で同じ配列を共有するため、書き換えられないようにする
+    _COLOR_CACHE.put_cache(cache_key, colored)
+
+    return colored
+
+def _compute_fractal(params, logger: DebugLogger) -> dict:
+    """ 設定されたパラメータでグリッドを作成し、フラクタルを計算 """
     resolution = 500
     center_x = params.get("center_x", 0.0)
     center_y = params.get("center_y", 0.0)
@@ -26,7 +60,8 @@ def render_fractal(params, logger: DebugLogger) -> np.ndarray:
     Z_unrotated_centered_origin = X + 1j * Y
     # 回転を適用
     if rotation_deg != 0:
-        logger.log(LogLevel.DEBUG, f"回転適用: {rotation_deg} 度")
+        if logger.is_enabled(LogLevel.DEBUG):
+            logger.log(LogLevel.DEBUG, f"回転適用: {rotation_deg} 度")
         rotation_rad = np.radians(rotation_deg) # 度からラジアンに変換
         rotation_operator = np.exp(1j * rotation_rad) # 回転演算子 (複素数)
         Z_rotated_centered_origin = Z_unrotated_centered_origin * rotation_operator # グリッドを回転
@@ -47,8 +82,4 @@ def render_fractal(params, logger: DebugLogger) -> np.ndarray:
         logger.log(LogLevel.DEBUG, "マンデルブロ集合の計算開始")
         # 回転・シフト後のグリッド Z を使用
         results = mandelbrot.compute_mandelbrot(Z, Z0, params["max_iterations"], logger)
-    # 着色アルゴリズムの適用
-    logger.log(LogLevel.DEBUG, "着色アルゴリズムの適用開始")
-    colored = color_algorithms.apply_coloring_algorithm(results, params, logger)
-
-    return colored
+    return results
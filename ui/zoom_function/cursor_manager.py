@@ -93,7 +93,8 @@ class CursorManager:
             try:
                 self.widget.config(cursor=new_cursor)
                 self._current_cursor = new_cursor
-                self.logger.log(LogLevel.DEBUG, f"カーソル変更 to '{new_cursor}'", {"state": state.name})
+                if self.logger.is_enabled(LogLevel.DEBUG):
+                    self.logger.log(LogLevel.DEBUG, f"カーソル変更 to '{new_cursor}'", {"state": state.name})
             except tk.TclError as e:
                 self.logger.log(LogLevel.ERROR, f"カーソルの設定に失敗 '{new_cursor}': {e}")
 
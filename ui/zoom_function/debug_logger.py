@@ -1,5 +1,5 @@
 import time
-import inspect
+import sys
 import os
 from typing import Optional, Dict, Any
 from .enums import LogLevel
@@ -17,13 +17,17 @@ class DebugLogger:
         # 自分自身の初期化ログを出力 (呼び出し元情報は __init__ 自身になる)
         self._log_internal(LogLevel.INIT, "DebugLogger", force=True, stacklevel=1)
 
+    def is_enabled(self, level: LogLevel) -> bool:
+        """ 指定レベルのログが出力されるか（出力されないなら、呼び出し側でメッセージの組み立てを省ける） """
+        return self.debug_enabled or level != LogLevel.DEBUG
+
     def log(
             self, level: LogLevel,
             message: str,
             context: Optional[Dict[str, Any]] = None,
             force: bool = False):
         """ ログを出力 (外部呼び出し用) """
-        if not self.debug_enabled and not force and level == LogLevel.DEBUG:
+        if level == LogLevel.DEBUG and not self.debug_enabled and not force: # 出力しない DEBUG ログは、呼び出し元の取得もせずに即座に戻る
             return
         # 呼び出し元を正しく特定するため stacklevel=2
         self._log_internal(level, message, context, force, stacklevel=2)
@@ -36,23 +40,25 @@ class DebugLogger:
             stacklevel: int = 1): # スタックレベルを指定可能にする
         """ ログ出力の内部実装 """
         # 呼び出し元の情報を取得
-        caller_frame_record = None # 呼び出し元のフレーム情報
+        caller_frame = None # 呼び出し元のフレーム
         file_path = "unknown"
         line_no = 0
         func_name = "unknown"
         try:
-            stack = inspect.stack()
-            if len(stack) > stacklevel:
-                 caller_frame_record = stack[stacklevel] # stacklevel番目のフレーム情報を取得
-            if caller_frame_record:
-                abs_path = os.path.abspath(caller_frame_record.filename)
+            # inspect.stack() は全フレームのソース行まで読み込むため重い：必要な1フレームだけを直接取得する
+            try:
+                caller_frame = sys._getframe(stacklevel) # stacklevel番目のフレームを取得
+            except ValueError: # スタックがそこまで深くない
+                caller_frame = None
+            if caller_frame:
+                abs_path = os.path.abspath(caller_frame.f_code.co_filename)
                 try:
                     relative_path = os.path.relpath(abs_path, self.project_root)
                     file_path = relative_path.replace('\\', '/')
                 except ValueError:
                     file_path = os.path.basename(abs_path)
-                line_no = caller_frame_record.lineno
-                func_name = caller_frame_record.function # 関数名を取得
+                line_no = caller_frame.f_lineno
+                func_name = caller_frame.f_code.co_name # 関数名を取得
         except Exception as e:
              print(f"[DebugLogger Error] Failed to get caller info: {e}")
         finally:
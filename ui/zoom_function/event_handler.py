@@ -368,7 +368,8 @@ class EventHandler:
                 new_angle = current_rect_angle + adjusted_delta_angle
                 self.rect_manager.set_rotation(new_angle)
                 self.previous_vector_angle = current_vector_angle # 次回のために更新
-                self.logger.log(LogLevel.DEBUG, f"回転 delta:{delta_angle:.2f} adj:{adjusted_delta_angle:.2f} new:{new_angle:.2f}")
+                if self.logger.is_enabled(LogLevel.DEBUG): # マウス移動のたびに呼ばれるため、出力しないときは文字列を組み立てない
+                    self.logger.log(LogLevel.DEBUG, f"回転 delta:{delta_angle:.2f} adj:{adjusted_delta_angle:.2f} new:{new_angle:.2f}")
                 self.zoom_selector.invalidate_rect_cache() # 回転中はキャッシュを無効化
                 self.canvas.draw_idle()
             # else: 閾値以下の変化は無視
@@ -452,7 +453,8 @@ class EventHandler:
             self.logger.log(LogLevel.DEBUG, "ESC: EDIT -> Undo/編集キャンセル呼び出し")
             self.undo_or_cancel_edit() # Undoまたは編集キャンセル
         elif state in [ZoomState.CREATE, ZoomState.ON_MOVE, ZoomState.RESIZING, ZoomState.ROTATING]:
-             self.logger.log(LogLevel.DEBUG, f"ESC: {state.name} -> 操作キャンセル呼び出し")
+             if self.logger.is_enabled(LogLevel.DEBUG):
+                 self.logger.log(LogLevel.DEBUG, f"ESC: {state.name} -> 操作キャンセル呼び出し")
              # ドラッグ操作中にESCが押された場合もキャンセル
              self.undo_or_cancel_edit()
 
@@ -483,7 +485,8 @@ class EventHandler:
         """ 編集履歴に状態を追加 """
         # None (矩形がない状態) を履歴に追加することも許可する
         self.edit_history.append(state)
-        self.logger.log(LogLevel.DEBUG, f"履歴追加: 現在の履歴数={len(self.edit_history)}")
+        if self.logger.is_enabled(LogLevel.DEBUG):
+            self.logger.log(LogLevel.DEBUG, f"履歴追加: 現在の履歴数={len(self.edit_history)}")
         # メモリリークを防ぐため、履歴数に上限を設けることも検討
         # MAX_HISTORY = 100
         # if len(self.edit_history) > MAX_HISTORY:
@@ -493,7 +496,8 @@ class EventHandler:
         """ 最後の履歴を削除 """
         if self.edit_history:
             removed = self.edit_history.pop()
-            self.logger.log(LogLevel.DEBUG, f"最後の履歴削除: 削除後の履歴数={len(self.edit_history)}")
+            if self.logger.is_enabled(LogLevel.DEBUG):
+                self.logger.log(LogLevel.DEBUG, f"最後の履歴削除: 削除後の履歴数={len(self.edit_history)}")
             return removed
         return None
 
@@ -99,7 +99,8 @@ class RectManager:
 
         # サイズチェックを追加
         if not self.is_valid_size(new_width, new_height):
-             self.logger.log(LogLevel.DEBUG, f"リサイズ中止：無効なサイズ w={new_width:.4f}, h={new_height:.4f}")
+             if self.logger.is_enabled(LogLevel.DEBUG):
+                 self.logger.log(LogLevel.DEBUG, f"リサイズ中止：無効なサイズ w={new_width:.4f}, h={new_height:.4f}")
              return # サイズが無効なら更新しない
 
         # --- 矩形プロパティを設定 (まだ回転は適用しない) ---
@@ -107,14 +108,15 @@ class RectManager:
         self.rect.set_height(new_height)
         self.rect.set_xy((new_x, new_y))
         # --- 設定ここまで ---
-        self.logger.log(LogLevel.DEBUG, f"リサイズ計算(回転前): x={new_x:.2f}, y={new_y:.2f}, w={new_width:.2f}, h={new_height:.2f}")
+        if self.logger.is_enabled(LogLevel.DEBUG): # マウス移動のたびに呼ばれるため、出力しないときは文字列を組み立てない
+            self.logger.log(LogLevel.DEBUG, f"リサイズ計算(回転前): x={new_x:.2f}, y={new_y:.2f}, w={new_width:.2f}, h={new_height:.2f}")
         # 最後に現在の回転角度を再適用
         self._apply_rotation()
 
     def is_valid_size(self, width: float, height: float) -> bool:
         """ 指定された幅と高さが有効か (最小サイズ以上か) """
         is_valid = width >= self.MIN_WIDTH and height >= self.MIN_HEIGHT
-        if not is_valid:
+        if not is_valid and self.logger.is_enabled(LogLevel.DEBUG):
             self.logger.log(LogLevel.DEBUG, f"無効なサイズチェック: w={width:.4f} (<{self.MIN_WIDTH}), h={height:.4f} (<{self.MIN_HEIGHT})")
         return is_valid
 
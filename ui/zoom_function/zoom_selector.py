@@ -172,7 +172,8 @@ class ZoomSelector:
         # dist_pixels = np.sqrt(((disp_coords[1] - disp_coords[0])**2).sum())
         # tol = tol_pixels * min_dim / dist_pixels if dist_pixels > 0 else 0.02
         tol = max(0.1 * min_dim, 0.02) # 短辺の10% or 最小許容範囲 (データ座標系)
-        self.logger.log(LogLevel.DEBUG, f"角判定の許容範囲(tol): {tol:.4f}")
+        if self.logger.is_enabled(LogLevel.DEBUG): # マウス移動のたびに呼ばれるため、出力しないときは文字列を組み立てない
+            self.logger.log(LogLevel.DEBUG, f"角判定の許容範囲(tol): {tol:.4f}")
 
 
         # 各回転後コーナーとの距離を計算
@@ -180,7 +181,8 @@ class ZoomSelector:
             if event.xdata is None or event.ydata is None: continue # 型ガード
             distance = np.hypot(event.xdata - corner_x, event.ydata - corner_y)
             if distance < tol:
-                self.logger.log(LogLevel.DEBUG, f"カーソルに近い角 {i} (距離: {distance:.3f} < 許容範囲: {tol:.3f})")
+                if self.logger.is_enabled(LogLevel.DEBUG):
+                    self.logger.log(LogLevel.DEBUG, f"カーソルに近い角 {i} (距離: {distance:.3f} < 許容範囲: {tol:.3f})")
                 return i # 近い角のインデックスを返す
 
         return None # どの角にも近くない